@@ -6,6 +6,7 @@ import cv2
 import time
 import math
 import threading
+from collections import OrderedDict
 from urllib.parse import urlencode
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
@@ -24,6 +25,12 @@ DEFAULT_CAMERA_SOURCE = int(CAMERA_SOURCE_ENV) if CAMERA_SOURCE_ENV.isdigit() el
 MIN_CONTOUR_AREA = float(os.environ.get("MIN_CONTOUR_AREA", "500"))
 DETECTION_COOLDOWN_S = float(os.environ.get("DETECTION_COOLDOWN_S", "2.0"))  # ✅ 2 seconds to avoid double-counts
 
+# Contour result cache: reuse detection when the scene hasn't changed (stopped belt, parked part)
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "0"))          # max cached frames, 0 disables (opt-in)
+RESULT_CACHE_HASH_SIZE = int(os.environ.get("RESULT_CACHE_HASH_SIZE", "16"))  # side of the hash grid (lookup key only)
+RESULT_CACHE_DOWNSCALE = int(os.environ.get("RESULT_CACHE_DOWNSCALE", "4"))   # px per cell of the sameness check
+RESULT_CACHE_MAX_DIFF = float(os.environ.get("RESULT_CACHE_MAX_DIFF", "10"))  # max gray-level diff per cell for a hit
+
 # ----------------------- Shared state -----------------------
 state_lock = threading.Lock()
 shared = {
@@ -165,15 +172,79 @@ def switch_camera(new_source):
     return True
 
 
-def process_frame(frame):
-    """Return (annotated_frame, decision or None if no new piece)."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+# ----------------------- Frame result cache -----------------------
+def frame_signature(gray):
+    """Return (key, small): an average-hash lookup key and the grayscale downsample used to confirm a hit."""
+    h, w = gray.shape
+    scale = max(RESULT_CACHE_DOWNSCALE, 1)
+    small = cv2.resize(gray, (max(w // scale, 1), max(h // scale, 1)), interpolation=cv2.INTER_AREA)
+    grid = cv2.resize(small, (RESULT_CACHE_HASH_SIZE, RESULT_CACHE_HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = grid > grid.mean()
+    return (gray.shape, bits.tobytes()), small
+
+
+class ResultCache:
+    """Thread-safe LRU of frame hash -> (downsample, detection).
+
+    The hash is only a fast path to a candidate; sensor noise flips bits
+    that sit near the mean, so on a key miss the other entries are scanned
+    too (most recent first). A hit always requires every cell of the
+    downsample to be within RESULT_CACHE_MAX_DIFF of the stored one, so a
+    part appearing or moving (even a small or dark one) is a miss.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, small):
+        """Return the (downsample, detection) entry on a hit, else None."""
+        with self.lock:
+            candidates = []
+            if key in self.entries:
+                candidates.append(key)
+            candidates.extend(k for k in reversed(self.entries) if k != key)
+            for k in candidates:
+                entry = self.entries[k]
+                if self._same(entry[0], small):
+                    self.entries.move_to_end(k)
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _same(cached_small, small):
+        return cached_small.shape == small.shape and \
+            cv2.absdiff(cached_small, small).max() <= RESULT_CACHE_MAX_DIFF
+
+    def put(self, key, small, detection):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (small, detection)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+
+result_cache = ResultCache(RESULT_CACHE_SIZE)
+
+
+def detect_frame(gray):
+    """Return detection or None, detection = (contour, shape, area, label, label_pos)."""
     blurred = cv2.GaussianBlur(gray, (5, 5), 0)
     edges = cv2.Canny(blurred, 50, 150)
 
     contours, _ = cv2.findContours(edges.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-    annotated = frame.copy()
     selected = None
     selected_area = 0
 
@@ -184,17 +255,60 @@ def process_frame(frame):
             selected = c
             selected_area = area
 
-    decision = None
-    if selected is not None:
-        shape = detect_shape(selected)
-        M = cv2.moments(selected)
-        if M["m00"] != 0:
-            cX = int(M["m10"] / M["m00"])
-            cY = int(M["m01"] / M["m00"])
+    if selected is None:
+        return None
+
+    shape = detect_shape(selected)
+    M = cv2.moments(selected)
+    if M["m00"] != 0:
+        cX = int(M["m10"] / M["m00"])
+        cY = int(M["m01"] / M["m00"])
+    else:
+        cX, cY = 10, 10
+
+    label = f"{shape} | Area: {int(selected_area)} px^2"
+    label_pos = (max(cX - 80, 10), max(cY - 10, 20))
+    return selected, shape, float(selected_area), label, label_pos
+
+
+def draw_detection(frame, detection):
+    """Draw the contour and label of a detection on a copy of the live frame."""
+    annotated = frame.copy()
+    if detection is None:
+        return annotated
+    contour, _, _, label, label_pos = detection
+    cv2.drawContours(annotated, [contour], -1, (0, 255, 0), 2)
+    cv2.putText(
+        annotated,
+        label,
+        label_pos,
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (255, 255, 255),
+        2,
+    )
+    return annotated
+
+
+def process_frame(frame):
+    """Return (annotated_frame, decision or None if no new piece)."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if RESULT_CACHE_SIZE > 0:
+        key, small = frame_signature(gray)
+        entry = result_cache.get(key, small)
+        if entry is not None:
+            _, detection = entry
         else:
-            cX, cY = 10, 10
+            detection = detect_frame(gray)
+            result_cache.put(key, small, detection)
+    else:
+        detection = detect_frame(gray)
+
+    annotated = draw_detection(frame, detection)
 
-        cv2.drawContours(annotated, [selected], -1, (0, 255, 0), 2)
+    decision = None
+    if detection is not None:
+        _, shape, selected_area, _, _ = detection
 
         now = time.monotonic()
         with state_lock:
@@ -229,17 +343,6 @@ def process_frame(frame):
                 daemon=True,
             ).start()
 
-        label = f"{shape} | Area: {int(selected_area)} px^2"
-        cv2.putText(
-            annotated,
-            label,
-            (max(cX - 80, 10), max(cY - 10, 20)),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            (255, 255, 255),
-            2,
-        )
-
     return annotated, decision
 
 
@@ -505,6 +608,7 @@ def status():
         # Report current camera index if it's an int; else 0 (for a path)
         cam_src = shared["camera_source"]
         cam_index = cam_src if isinstance(cam_src, int) else 0
+        cache = result_cache.stats()
         return jsonify(
             last_shape=shared["last_shape"],
             last_area=shared["last_area"],
@@ -516,6 +620,9 @@ def status():
             expected_area=shared["expected_area"],
             tolerance=shared["tolerance"],
             camera_index=cam_index,
+            cache_hits=cache["hits"],
+            cache_misses=cache["misses"],
+            cache_size=cache["size"],
         )
 
 
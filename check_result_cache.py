@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Check the frame result cache on synthetic belt frames.
+
+Noisy copies of a static scene must hit; a part that moves, appears or
+changes size must miss. Exits non-zero if any expectation fails.
+"""
+import argparse
+import cv2
+import numpy as np
+
+from app_detect_dashboard import ResultCache, frame_signature, detect_frame
+
+
+def make_frame(rect=None, belt=(120, 120, 120), part=(40, 40, 40), size=(480, 640)):
+    """Flat belt with an optional dark part, rect = (x, y, w, h)."""
+    frame = np.empty((size[0], size[1], 3), np.uint8)
+    frame[:] = belt
+    # darker band on one side so a part can sit in an already dark area
+    frame[:, : size[1] // 4] = (60, 60, 60)
+    if rect is not None:
+        x, y, w, h = rect
+        frame[y:y + h, x:x + w] = part
+    return frame
+
+
+def add_noise(frame, sigma, rng):
+    noisy = frame.astype(np.float32) + rng.normal(0, sigma, frame.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def lookup(cache, frame):
+    """Mimic process_frame: return True on a cache hit, store on a miss."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    key, small = frame_signature(gray)
+    if cache.get(key, small) is not None:
+        return True
+    cache.put(key, small, detect_frame(gray))
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check result cache hit/miss behaviour on synthetic frames.")
+    parser.add_argument("--frames", type=int, default=200, help="Static frames per noise level (default: 200).")
+    parser.add_argument("--size", type=int, default=8, help="Cache size (default: 8).")
+    parser.add_argument("--sigma", type=float, nargs="+", default=[1.0, 2.0, 3.0, 4.0],
+                        help="Gaussian noise levels to test (default: 1 2 3 4).")
+    parser.add_argument("--min-hit-rate", type=float, default=0.95,
+                        help="Required hit rate on a static scene (default: 0.95).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    parked = (300, 200, 60, 40)
+    failures = []
+
+    for sigma in args.sigma:
+        cache = ResultCache(args.size)
+        base = make_frame(parked)
+        hits = sum(lookup(cache, add_noise(base, sigma, rng)) for _ in range(args.frames))
+        # first frame is always a miss
+        rate = hits / max(args.frames - 1, 1)
+        print(f"static scene, sigma={sigma}: {hits}/{args.frames} hits, {cache.stats()}")
+        if rate < args.min_hit_rate:
+            failures.append(f"static sigma={sigma} hit rate {rate:.2f} < {args.min_hit_rate}")
+
+    # Scene changes that must be detected on the very next frame
+    changes = {
+        "part moved 3 px": (parked, (303, 200, 60, 40)),
+        "part grew 2 px": (parked, (300, 200, 62, 41)),
+        "part appears on belt": (None, parked),
+        "small part in dark area": (None, (40, 200, 25, 25)),
+    }
+    sigma = max(args.sigma)
+    for name, (before, after) in changes.items():
+        cache = ResultCache(args.size)
+        for _ in range(5):
+            lookup(cache, add_noise(make_frame(before), sigma, rng))
+        hit = lookup(cache, add_noise(make_frame(after), sigma, rng))
+        print(f"{name}: {'HIT (wrong)' if hit else 'miss'}")
+        if hit:
+            failures.append(name)
+
+    if failures:
+        raise SystemExit("FAILED: " + "; ".join(failures))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()